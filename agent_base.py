@@ -1,12 +1,17 @@
 import asyncio
 import json
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Optional
+from typing import Callable, Deque, Dict, List, Any, Optional, Tuple
 from enum import Enum
+import itertools
+import logging
 import uuid
 import time
 
+logger = logging.getLogger(__name__)
+
 
 class MessageType(Enum):
     TASK_REQUEST = "task_request"
@@ -16,8 +21,26 @@ class MessageType(Enum):
     RESULT = "result"
 
 
+# Enum .value goes through a descriptor; a plain dict lookup is cheaper
+_MT_VALUE = {message_type: message_type.value for message_type in MessageType}
+
+# Messages travel between agents as plain tuples laid out in Message field order;
+# Message itself is only built when a readable object is needed
+MessageTuple = Tuple[str, str, str, MessageType, Dict[str, Any], float]
+MSG_ID, MSG_SENDER, MSG_RECIPIENT, MSG_TYPE, MSG_CONTENT, MSG_TIMESTAMP = range(6)
+
+# Recipient name agents use for messages meant for the coordinator itself
+COORDINATOR_NAME = "Coordinator"
+
+# Process-wide sequence for message ids; shared so ids stay unique across agents
+_ID_COUNTER = itertools.count()
+
+
 @dataclass
 class Message:
+    # Declared by hand rather than via dataclass(slots=True) to keep Python 3.7 support
+    __slots__ = ('id', 'sender', 'recipient', 'message_type', 'content', 'timestamp')
+    
     id: str
     sender: str
     recipient: str
@@ -25,73 +48,106 @@ class Message:
     content: Dict[str, Any]
     timestamp: float
     
+    @classmethod
+    def from_tuple(cls, message: MessageTuple) -> 'Message':
+        return cls(*message)
+    
+    def as_tuple(self) -> MessageTuple:
+        return (self.id, self.sender, self.recipient, self.message_type, self.content, self.timestamp)
+    
     def to_dict(self) -> Dict:
         return {
             'id': self.id,
             'sender': self.sender,
             'recipient': self.recipient,
-            'message_type': self.message_type.value,
+            'message_type': _MT_VALUE[self.message_type],
             'content': self.content,
             'timestamp': self.timestamp
         }
 
 
 class Agent(ABC):
+    # Message ids only need to be unique within this process; set to True
+    # to fall back to uuid4 ids when messages leave it
+    use_uuid_ids = False
+    
     def __init__(self, name: str, coordinator=None):
         self.name = name
         self.coordinator = coordinator
-        self.message_queue: asyncio.Queue = asyncio.Queue()
-        self.is_running = False
+        # Each agent is the only consumer of its inbox, so a deque plus a
+        # wake-up event is enough and cheaper than asyncio.Queue
+        self._inbox: Deque[MessageTuple] = deque()
+        self._inbox_ready = asyncio.Event()
         
     @abstractmethod
     async def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         pass
     
+    async def _offload(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking `fn` in the coordinator's worker pool so other agents keep running"""
+        pool = self.coordinator.executor if self.coordinator else None
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    
     async def send_message(self, recipient: str, message_type: MessageType, content: Dict[str, Any]):
-        message = Message(
-            id=str(uuid.uuid4()),
-            sender=self.name,
-            recipient=recipient,
-            message_type=message_type,
-            content=content,
-            timestamp=time.time()
-        )
+        if self.use_uuid_ids:
+            message_id = str(uuid.uuid4())
+        else:
+            message_id = f"{self.name}-{next(_ID_COUNTER)}"
+        
+        message = (message_id, self.name, recipient, message_type, content, time.time())
         
         if self.coordinator:
-            await self.coordinator.route_message(message)
+            await self.coordinator.route_tuple(message)
     
-    async def receive_message(self, message: Message):
-        await self.message_queue.put(message)
+    async def receive_message(self, message: MessageTuple):
+        self._inbox.append(message)
+        self._inbox_ready.set()
     
     async def start(self):
-        self.is_running = True
-        print(f"🤖 {self.name} agent started")
+        """Process messages until the task running this coroutine is cancelled"""
+        logger.info("🤖 %s agent started", self.name)
         
-        while self.is_running:
-            try:
-                message = await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
-                await self.handle_message(message)
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                print(f"❌ Error in {self.name}: {e}")
+        while True:
+            await self._inbox_ready.wait()
+            self._inbox_ready.clear()
+            
+            while self._inbox:
+                message = self._inbox.popleft()
+                try:
+                    await self.handle_message(message)
+                except asyncio.CancelledError:
+                    # CancelledError subclasses Exception before Python 3.8
+                    raise
+                except Exception as e:
+                    logger.error("❌ Error in %s: %s", self.name, e)
     
-    async def handle_message(self, message: Message):
-        print(f"📨 {self.name} received {message.message_type.value} from {message.sender}")
+    async def handle_message(self, message: MessageTuple):
+        message_type = message[MSG_TYPE]
+        logger.debug("📨 %s received %s from %s", self.name, _MT_VALUE[message_type], message[MSG_SENDER])
         
-        if message.message_type == MessageType.TASK_REQUEST:
-            result = await self.process_task(message.content)
-            await self.send_message(
-                message.sender,
-                MessageType.TASK_RESPONSE,
-                {"result": result, "original_task_id": message.id}
-            )
-        elif message.message_type == MessageType.COLLABORATION_REQUEST:
-            await self.handle_collaboration_request(message)
+        handler = self._DISPATCH.get(message_type)
+        if handler:
+            await handler(self, message)
+    
+    async def _handle_task_request(self, message: MessageTuple):
+        result = await self.process_task(message[MSG_CONTENT])
+        await self.send_message(
+            message[MSG_SENDER],
+            MessageType.TASK_RESPONSE,
+            {"result": result, "original_task_id": message[MSG_ID]}
+        )
+    
+    async def _handle_collab(self, message: MessageTuple):
+        await self.handle_collaboration_request(Message.from_tuple(message))
+    
+    # Message types an agent acts on; anything else is only logged
+    _DISPATCH = {
+        MessageType.TASK_REQUEST: _handle_task_request,
+        MessageType.COLLABORATION_REQUEST: _handle_collab,
+    }
     
     async def handle_collaboration_request(self, message: Message):
         pass
     
     async def stop(self):
-        self.is_running = False
-        print(f"🛑 {self.name} agent stopped")
\ No newline at end of file
+        logger.info("🛑 %s agent stopped", self.name)
\ No newline at end of file
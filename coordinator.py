@@ -1,49 +1,118 @@
 import asyncio
+import itertools
 import json
-from typing import Dict, List, Any, Optional
-from agent_base import Agent, Message, MessageType
+import logging
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Any, Optional, Tuple
+from agent_base import (
+    COORDINATOR_NAME, Agent, Message, MessageTuple, MessageType,
+    MSG_CONTENT, MSG_ID, MSG_RECIPIENT, MSG_SENDER, MSG_TIMESTAMP, MSG_TYPE, _MT_VALUE
+)
 from specialized_agents import PlannerAgent, ExecutorAgent
 import time
 
+try:
+    import orjson  # Optional: faster history_json()
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _finite_or_null(value):
+    """Replace non-finite floats with None, as orjson does, so both encoders agree"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite_or_null(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite_or_null(item) for item in value]
+    return value
+
 
 class TaskCoordinator:
     """Central coordinator managing agent communication and task distribution"""
     
-    def __init__(self):
+    def __init__(self, history_limit: int = 10_000):
         self.agents: Dict[str, Agent] = {}
-        self.message_history: List[Message] = []
+        self.history_limit = history_limit
+        self.message_history: Deque[MessageTuple] = deque(maxlen=history_limit)
         self.active_tasks: Dict[str, Dict] = {}
         self.task_counter = 0
+        self._agent_tasks: List[asyncio.Task] = []
+        # Resolved with the executor's final RESULT for each submitted task
+        self._task_futures: Dict[str, asyncio.Future] = {}
+        # Bumped whenever agents, tasks or history change; keys the print_status cache
+        self._state_version = 0
+        self._status_cache: Optional[Tuple[int, str]] = None
+        self._agent_names: List[str] = []
+        # Shared by all agents for blocking work; created by start_agents
+        self.executor: Optional[ThreadPoolExecutor] = None
         
     def register_agent(self, agent: Agent):
+        if agent.name not in self.agents:
+            self._agent_names.append(agent.name)
         self.agents[agent.name] = agent
+        self._state_version += 1
         agent.coordinator = self
-        print(f"🔗 Registered agent: {agent.name}")
+        logger.info("🔗 Registered agent: %s", agent.name)
     
     async def route_message(self, message: Message):
+        await self.route_tuple(message.as_tuple())
+    
+    async def route_tuple(self, message: MessageTuple):
+        if message[MSG_RECIPIENT] == COORDINATOR_NAME:
+            self._handle_coordinator_message(message)
+            return
+        
         self.message_history.append(message)
+        self._state_version += 1
+        if message[MSG_TYPE] == MessageType.RESULT:
+            self._complete_task(message[MSG_CONTENT])
         
-        recipient = self.agents.get(message.recipient)
+        recipient = self.agents.get(message[MSG_RECIPIENT])
         if recipient:
             await recipient.receive_message(message)
         else:
-            print(f"⚠️ Unknown recipient: {message.recipient}")
+            logger.warning("⚠️ Unknown recipient: %s", message[MSG_RECIPIENT])
+    
+    def _handle_coordinator_message(self, message: MessageTuple):
+        """Apply progress reports to active_tasks; these are not kept in history"""
+        if message[MSG_TYPE] != MessageType.STATUS_UPDATE:
+            logger.warning("⚠️ Coordinator ignored %s from %s",
+                           _MT_VALUE[message[MSG_TYPE]], message[MSG_SENDER])
+            return
+        
+        content = message[MSG_CONTENT]
+        for update in content.get("batch", [content]):
+            task = self.active_tasks.get(update.get("task_id"))
+            if task is None or task["status"] in ("completed", "failed"):
+                continue
+            task["status"] = "in_progress"
+            task["progress"] = update.get("progress", 0.0)
+        self._state_version += 1
     
     async def submit_user_task(self, task_description: str) -> str:
         self.task_counter += 1
-        task_id = f"task_{self.task_counter}_{int(time.time())}"
+        now = time.time()  # One clock read shared by the id, the task and its message
+        task_id = f"task_{self.task_counter}_{int(now)}"
         
         task = {
             "id": task_id,
             "description": task_description,
-            "submitted_at": time.time(),
+            "submitted_at": now,
             "status": "submitted"
         }
         
         self.active_tasks[task_id] = task
+        self._state_version += 1
+        self._task_futures[task_id] = asyncio.get_running_loop().create_future()
         
-        print(f"📥 New task submitted: {task_description}")
-        print(f"🆔 Task ID: {task_id}")
+        logger.info("📥 New task submitted: %s", task_description)
+        logger.info("🆔 Task ID: %s", task_id)
         
         # Route task to PlannerAgent first
         await self.route_message(Message(
@@ -52,7 +121,7 @@ class TaskCoordinator:
             recipient="Planner",
             message_type=MessageType.TASK_REQUEST,
             content=task,
-            timestamp=time.time()
+            timestamp=now
         ))
         
         return task_id
@@ -60,95 +129,174 @@ class TaskCoordinator:
     async def get_task_status(self, task_id: str) -> Optional[Dict]:
         return self.active_tasks.get(task_id)
     
+    async def wait_for_task(self, task_id: str, timeout: float = 30.0) -> Optional[Dict]:
+        """Wait for the final result of `task_id`; returns None if it is unknown or times out"""
+        future = self._task_futures.get(task_id)
+        if future is None:
+            task = self.active_tasks.get(task_id)
+            return task.get("result") if task else None
+        
+        try:
+            # Shielded so a timed-out wait leaves the task resolvable for other waiters
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    def _complete_task(self, result: Dict[str, Any]):
+        task_id = result.get("results", {}).get("plan_id")
+        task = self.active_tasks.get(task_id)
+        if task is not None:
+            # A failed plan still resolves its waiters instead of leaving them to time out
+            task["status"] = result.get("results", {}).get("overall_status", "completed")
+            task["result"] = result
+        
+        future = self._task_futures.pop(task_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+    
+    def recent_messages(self, limit: int) -> List[MessageTuple]:
+        """Return the last `limit` messages, oldest first, without walking the whole history"""
+        recent = list(itertools.islice(reversed(self.message_history), limit))
+        recent.reverse()
+        return recent
+    
     def get_message_history(self, limit: int = 10) -> List[Dict]:
-        recent_messages = self.message_history[-limit:] if limit > 0 else self.message_history
-        return [msg.to_dict() for msg in recent_messages]
+        recent_messages = self.recent_messages(limit) if limit > 0 else self.message_history
+        return [Message.from_tuple(msg).to_dict() for msg in recent_messages]
+    
+    def history_json(self, limit: int = 10) -> bytes:
+        """Serialize recent history straight to UTF-8 JSON, without building Message objects"""
+        recent_messages = self.recent_messages(limit) if limit > 0 else self.message_history
+        payload = [
+            {
+                'id': msg[MSG_ID],
+                'sender': msg[MSG_SENDER],
+                'recipient': msg[MSG_RECIPIENT],
+                'message_type': _MT_VALUE[msg[MSG_TYPE]],
+                'content': msg[MSG_CONTENT],
+                'timestamp': msg[MSG_TIMESTAMP]
+            }
+            for msg in recent_messages
+        ]
+        
+        if orjson is not None:
+            try:
+                return orjson.dumps(payload)
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers beyond 64 bits; the stdlib encoder handles those
+        return json.dumps(
+            _finite_or_null(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
     
     async def start_agents(self):
-        print("🚀 Starting all agents...")
-        tasks = []
+        logger.info("🚀 Starting all agents...")
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        
         for agent in self.agents.values():
             task = asyncio.create_task(agent.start())
-            tasks.append(task)
+            self._agent_tasks.append(task)
         
-        return tasks
+        return self._agent_tasks
     
     async def stop_agents(self):
-        print("🛑 Stopping all agents...")
+        logger.info("🛑 Stopping all agents...")
+        for task in self._agent_tasks:
+            task.cancel()
+        await asyncio.gather(*self._agent_tasks, return_exceptions=True)
+        self._agent_tasks = []
+        
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        
         for agent in self.agents.values():
             await agent.stop()
     
     def print_status(self):
-        print("\n" + "="*50)
-        print("📊 SYSTEM STATUS")
-        print("="*50)
-        print(f"Active Agents: {len(self.agents)}")
-        for name in self.agents.keys():
-            print(f"  • {name}")
-        
-        print(f"\nActive Tasks: {len(self.active_tasks)}")
+        # Re-render only when something shown here has changed since the last call
+        if self._status_cache is None or self._status_cache[0] != self._state_version:
+            self._status_cache = (self._state_version, self._render_status())
+        print(self._status_cache[1])
+    
+    def _render_status(self) -> str:
+        lines = [
+            "\n" + "="*50,
+            "📊 SYSTEM STATUS",
+            "="*50,
+            f"Active Agents: {len(self._agent_names)}"
+        ]
+        for name in self._agent_names:
+            lines.append(f"  • {name}")
+        
+        lines.append(f"\nActive Tasks: {len(self.active_tasks)}")
         for task_id, task in self.active_tasks.items():
-            print(f"  • {task_id}: {task['description'][:50]}...")
+            lines.append(f"  • {task_id}: {task['description'][:50]}...")
         
-        print(f"\nMessage History: {len(self.message_history)} messages")
+        lines.append(f"\nMessage History: {len(self.message_history)} messages")
         
         # Show recent messages
         if self.message_history:
-            print("\n📨 Recent Messages:")
-            for msg in self.message_history[-3:]:
-                print(f"  {msg.sender} → {msg.recipient}: {msg.message_type.value}")
+            lines.append("\n📨 Recent Messages:")
+            for msg in self.recent_messages(3):
+                lines.append(f"  {msg[MSG_SENDER]} → {msg[MSG_RECIPIENT]}: {_MT_VALUE[msg[MSG_TYPE]]}")
         
-        print("="*50 + "\n")
+        lines.append("="*50 + "\n")
+        return "\n".join(lines)
 
 
 class DemoScenarios:
     """Predefined demo scenarios showcasing agent collaboration"""
     
-    def __init__(self, coordinator: TaskCoordinator):
+    def __init__(self, coordinator: TaskCoordinator, task_timeout: float = 30.0):
         self.coordinator = coordinator
+        self.task_timeout = task_timeout
         
     async def run_data_analysis_demo(self):
-        print("🎬 Running Data Analysis Demo")
-        await self.coordinator.submit_user_task(
+        logger.info("🎬 Running Data Analysis Demo")
+        task_id = await self.coordinator.submit_user_task(
             "Analyze sales data from Q3 2024 and generate insights report"
         )
-        await asyncio.sleep(10)  # Let agents work
+        await self._wait_for(task_id)
     
     async def run_calculation_demo(self):
-        print("🎬 Running Calculation Demo")
-        await self.coordinator.submit_user_task(
+        logger.info("🎬 Running Calculation Demo")
+        task_id = await self.coordinator.submit_user_task(
             "Calculate the compound interest for $1000 at 5% annually for 10 years"
         )
-        await asyncio.sleep(8)  # Let agents work
+        await self._wait_for(task_id)
     
     async def run_text_processing_demo(self):
-        print("🎬 Running Text Processing Demo")
-        await self.coordinator.submit_user_task(
+        logger.info("🎬 Running Text Processing Demo")
+        task_id = await self.coordinator.submit_user_task(
             "Process and format the user manual text for better readability"
         )
-        await asyncio.sleep(6)  # Let agents work
+        await self._wait_for(task_id)
     
     async def run_web_scraping_demo(self):
-        print("🎬 Running Web Scraping Demo")
-        await self.coordinator.submit_user_task(
+        logger.info("🎬 Running Web Scraping Demo")
+        task_id = await self.coordinator.submit_user_task(
             "Scrape product information from e-commerce sites and create comparison report"
         )
-        await asyncio.sleep(12)  # Let agents work
+        await self._wait_for(task_id)
+    
+    async def _wait_for(self, task_id: str):
+        result = await self.coordinator.wait_for_task(task_id, self.task_timeout)
+        if result is None:
+            logger.warning("⏰ Task %s did not finish within %ss", task_id, self.task_timeout)
+        elif result["results"].get("overall_status") == "failed":
+            logger.warning("❌ Task %s failed", task_id)
     
     async def run_all_demos(self):
-        print("🎭 Running all demo scenarios...")
-        await self.run_data_analysis_demo()
-        await asyncio.sleep(2)
-        
-        await self.run_calculation_demo()
-        await asyncio.sleep(2)
-        
-        await self.run_text_processing_demo()
-        await asyncio.sleep(2)
-        
-        await self.run_web_scraping_demo()
+        logger.info("🎭 Running all demo scenarios...")
+        await asyncio.gather(
+            self.run_data_analysis_demo(),
+            self.run_calculation_demo(),
+            self.run_text_processing_demo(),
+            self.run_web_scraping_demo()
+        )
         
-        print("🎉 All demos completed!")
+        logger.info("🎉 All demos completed!")
 
 
 async def create_demo_system() -> TaskCoordinator:
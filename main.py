@@ -7,12 +7,24 @@ Usage:
   python main.py                    # Run interactive mode
   python main.py --demo             # Run all demo scenarios
   python main.py --demo <scenario>  # Run specific demo scenario
+
+Set LOG_LEVEL=DEBUG to also see every message delivered between agents.
 """
 
 import asyncio
+import logging
+import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from coordinator import TaskCoordinator, DemoScenarios, create_demo_system
 
+try:
+    import uvloop  # Optional: faster drop-in event loop
+except ImportError:
+    uvloop = None
+
 
 class UserInterface:
     """Simple command-line interface for interacting with the agent system"""
@@ -29,12 +41,12 @@ class UserInterface:
         print()
         
         # Start agent tasks in background
-        agent_tasks = await self.coordinator.start_agents()
+        await self.coordinator.start_agents()
         
         try:
             while self.running:
                 try:
-                    user_input = input("💭 Enter task: ").strip()
+                    user_input = (await self._aprompt("💭 Enter task: ")).strip()
                     
                     if not user_input:
                         continue
@@ -49,8 +61,35 @@ class UserInterface:
         
         finally:
             await self.coordinator.stop_agents()
-            for task in agent_tasks:
-                task.cancel()
+    
+    async def _aprompt(self, text: str) -> str:
+        """Read a line from stdin without blocking the agents' event loop"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def resolve(line, error):
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(line)
+        
+        def read_line():
+            line, error = None, None
+            try:
+                line = input(text)
+            except Exception as e:
+                error = e
+            try:
+                loop.call_soon_threadsafe(resolve, line, error)
+            except RuntimeError:
+                pass  # Loop already closed; nobody is waiting for this line
+        
+        # A daemon thread rather than the default executor: asyncio.run waits for
+        # executor threads on shutdown, which would hang on a pending input()
+        threading.Thread(target=read_line, daemon=True).start()
+        return await future
     
     async def handle_user_input(self, user_input: str):
         command = user_input.lower()
@@ -131,7 +170,7 @@ class UserInterface:
         print("0. Back to main menu")
         
         try:
-            choice = input("\nSelect demo (0-5): ").strip()
+            choice = (await self._aprompt("\nSelect demo (0-5): ")).strip()
             
             demos = DemoScenarios(self.coordinator)
             
@@ -183,7 +222,7 @@ async def run_demo_mode(args):
     demos = DemoScenarios(coordinator)
     
     # Start agents
-    agent_tasks = await coordinator.start_agents()
+    await coordinator.start_agents()
     
     try:
         if not args:
@@ -206,17 +245,46 @@ async def run_demo_mode(args):
                 return
     
     finally:
-        await asyncio.sleep(2)  # Let final messages process
         await coordinator.stop_agents()
-        for task in agent_tasks:
-            task.cancel()
+
+
+def setup_logging() -> QueueListener:
+    """Send agent log records to stdout from a background thread"""
+    log_queue = queue.SimpleQueue()
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    level_name = (os.environ.get("LOG_LEVEL") or "INFO").strip().upper()
+    # getLevelName maps known names to their number and returns a string otherwise
+    level = int(level_name) if level_name.isdigit() else logging.getLevelName(level_name)
+    if isinstance(level, int):
+        root.setLevel(level)
+    else:
+        print(f"⚠️ Unknown LOG_LEVEL {level_name!r}, using INFO")
+        root.setLevel(logging.INFO)
+    
+    listener = QueueListener(log_queue, stdout_handler)
+    listener.start()
+    return listener
 
 
 if __name__ == "__main__":
+    log_listener = setup_logging()
     try:
-        asyncio.run(main())
+        if uvloop is None:
+            asyncio.run(main())
+        elif hasattr(uvloop, "run"):
+            uvloop.run(main())
+        else:
+            # uvloop.run only exists from uvloop 0.18; older installs go through the policy
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
     except Exception as e:
         print(f"❌ Error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        log_listener.stop()
\ No newline at end of file
@@ -1,9 +1,99 @@
+import ast
 import asyncio
+import functools
+import logging
+import math
+import operator
 import re
-from typing import Dict, List, Any
-from agent_base import Agent, MessageType
+import sys
+from typing import Dict, List, Any, Optional
+from agent_base import COORDINATOR_NAME, Agent, MessageType
 import json
 
+logger = logging.getLogger(__name__)
+
+# Checked in order; the first pattern found anywhere in the description wins
+_TASK_TYPE_PATTERNS = [
+    (re.compile(r"analyze|data|statistics", re.IGNORECASE), "data_analysis"),
+    (re.compile(r"scrape|web|extract", re.IGNORECASE), "web_scraping"),
+    (re.compile(r"calculate|compute|math", re.IGNORECASE), "calculation"),
+    (re.compile(r"text|process|format", re.IGNORECASE), "text_processing"),
+]
+
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+# Runs of digits, brackets and arithmetic operators, e.g. "2 + 3 * (4 - 1)"
+_EXPR_RE = re.compile(r'[-\d.(][\d\s.()+\-*/]*[\d.)]')
+# "compound interest for $1000 at 5% annually for 10 years"
+_COMPOUND_INTEREST_RE = re.compile(
+    r'compound interest\D*?(\d+(?:\.\d+)?)\D*?(\d+(?:\.\d+)?)\s*%\D*?(\d+)\s*years?',
+    re.IGNORECASE
+)
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+# Bounds on calculator input and output, so a single request cannot make
+# the parser recurse deeply or ** build enormous integers
+_MAX_EXPRESSION_LENGTH = 200
+_MAX_NUMBER_LENGTH = 400
+_MAX_RESULT_BITS = 1024
+# ISO and slash dates look like subtraction and division; blank them out first
+_DATE_RE = re.compile(r'\b\d{4}-\d{1,2}-\d{1,2}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b')
+
+
+def _to_number(text: str):
+    # int() refuses very long digit strings (Python 3.11+); fail the same way everywhere
+    if len(text) > _MAX_NUMBER_LENGTH:
+        raise ValueError("number too long")
+    return float(text) if "." in text else int(text)
+
+
+def _calculation_failed(error: str, **details) -> Dict[str, Any]:
+    return {"calculation_result": "Unable to calculate", "operation": "unknown", **details, "error": error}
+
+
+def _constant_value(node: ast.AST):
+    if isinstance(node, ast.Constant):
+        return node.value
+    if sys.version_info < (3, 8) and isinstance(node, ast.Num):
+        return node.n
+    return None
+
+
+def _check_result(value):
+    if isinstance(value, complex):
+        raise ValueError("complex result")
+    if isinstance(value, int) and value.bit_length() > _MAX_RESULT_BITS:
+        raise ValueError("result too large")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError("result is not finite")
+    return value
+
+
+def _eval_arithmetic(node: ast.AST):
+    """Evaluate a parsed expression, allowing only numbers and + - * / **"""
+    if isinstance(node, ast.Expression):
+        return _eval_arithmetic(node.body)
+    value = _constant_value(node)
+    if type(value) in (int, float):
+        return value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        left = _eval_arithmetic(node.left)
+        right = _eval_arithmetic(node.right)
+        # Refuse a power before computing it if the result would be too large
+        if (isinstance(node.op, ast.Pow) and isinstance(left, int) and isinstance(right, int)
+                and right > 0 and (abs(left).bit_length() - 1) * right > _MAX_RESULT_BITS):
+            raise ValueError("result too large")
+        return _check_result(_BINARY_OPS[type(node.op)](left, right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _check_result(_UNARY_OPS[type(node.op)](_eval_arithmetic(node.operand)))
+    raise ValueError(f"unsupported expression: {type(node).__name__}")
+
 
 class PlannerAgent(Agent):
     """Agent responsible for breaking down complex tasks into subtasks"""
@@ -19,48 +109,52 @@ class PlannerAgent(Agent):
     
     async def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         task_description = task.get("description", "")
-        task_type = self.identify_task_type(task_description)
         
-        print(f"🧠 {self.name} analyzing task: {task_description}")
+        logger.info("🧠 %s analyzing task: %s", self.name, task_description)
         await asyncio.sleep(1)  # Simulate thinking time
         
+        plan = await self._offload(self._process_task_sync, task)
+        subtasks = plan["subtasks"]
+        
+        logger.info("📋 %s created plan with %d subtasks", self.name, len(subtasks))
+        
+        # Request collaboration from ExecutorAgent
+        await self.send_message(
+            "Executor",
+            MessageType.COLLABORATION_REQUEST,
+            {"action": "execute_plan", "plan": plan}
+        )
+        
+        return plan
+    
+    def _process_task_sync(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        task_description = task.get("description", "")
+        task_type = self.identify_task_type(task_description)
+        
         if task_type in self.task_templates:
             subtasks = self.task_templates[task_type]
         else:
             subtasks = self.create_generic_plan(task_description)
         
-        plan = {
+        return {
             "task_id": task.get("id"),
             "original_task": task_description,
             "task_type": task_type,
             "subtasks": subtasks,
             "estimated_duration": len(subtasks) * 2
         }
-        
-        print(f"📋 {self.name} created plan with {len(subtasks)} subtasks")
-        
-        # Request collaboration from ExecutorAgent
-        await self.send_message(
-            "Executor",
-            MessageType.COLLABORATION_REQUEST,
-            {"action": "execute_plan", "plan": plan}
-        )
-        
-        return plan
     
     def identify_task_type(self, description: str) -> str:
-        description_lower = description.lower()
-        
-        if any(word in description_lower for word in ["analyze", "data", "statistics"]):
-            return "data_analysis"
-        elif any(word in description_lower for word in ["scrape", "web", "extract"]):
-            return "web_scraping"
-        elif any(word in description_lower for word in ["calculate", "compute", "math"]):
-            return "calculation"
-        elif any(word in description_lower for word in ["text", "process", "format"]):
-            return "text_processing"
-        else:
-            return "generic"
+        return self._classify(description)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _classify(description: str) -> str:
+        # Cached across all planners, so repeated descriptions skip the scan
+        for pattern, task_type in _TASK_TYPE_PATTERNS:
+            if pattern.search(description):
+                return task_type
+        return "generic"
     
     def create_generic_plan(self, description: str) -> List[str]:
         return ["understand_requirements", "gather_resources", "execute_main_task", "verify_results"]
@@ -69,8 +163,17 @@ class PlannerAgent(Agent):
 class ExecutorAgent(Agent):
     """Agent responsible for executing tasks and subtasks"""
     
-    def __init__(self, name: str = "Executor", coordinator=None):
+    def __init__(self, name: str = "Executor", coordinator=None,
+                 status_batch_size: int = 2, status_flush_interval: float = 0.5):
         super().__init__(name, coordinator)
+        # Progress updates are sent once this many are pending, or once the
+        # oldest pending one has waited status_flush_interval seconds
+        self.status_batch_size = status_batch_size
+        self.status_flush_interval = status_flush_interval
+        self._pending_updates: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Finished subtask count per running plan, keyed by task id
+        self._completed_subtasks: Dict[str, int] = {}
         self.execution_methods = {
             "collect_data": self.simulate_data_collection,
             "clean_data": self.simulate_data_cleaning,
@@ -82,20 +185,23 @@ class ExecutorAgent(Agent):
     
     async def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         task_description = task.get("description", "")
-        print(f"⚡ {self.name} executing task: {task_description}")
+        logger.info("⚡ %s executing task: %s", self.name, task_description)
         
         # Simulate task execution
         await asyncio.sleep(2)
         
-        result = {
+        result = await self._offload(self._process_task_sync, task)
+        
+        logger.info("✅ %s completed task", self.name)
+        return result
+    
+    def _process_task_sync(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "task_completed": True,
             "execution_time": 2.0,
-            "output": f"Successfully executed: {task_description}",
+            "output": f"Successfully executed: {task.get('description', '')}",
             "status": "completed"
         }
-        
-        print(f"✅ {self.name} completed task")
-        return result
     
     async def handle_collaboration_request(self, message):
         content = message.content
@@ -106,32 +212,33 @@ class ExecutorAgent(Agent):
     
     async def execute_plan(self, plan: Dict[str, Any]):
         subtasks = plan.get("subtasks", [])
-        print(f"🚀 {self.name} executing plan with {len(subtasks)} subtasks")
+        logger.info("🚀 %s executing plan with %d subtasks", self.name, len(subtasks))
+        
+        task_id = plan.get("task_id")
+        self._completed_subtasks[task_id] = 0
+        try:
+            # Let siblings finish even if one raises so the plan always reports back
+            outcomes = await asyncio.gather(*[
+                self._run_one_subtask(plan, i, subtask, len(subtasks))
+                for i, subtask in enumerate(subtasks)
+            ], return_exceptions=True)
+        finally:
+            del self._completed_subtasks[task_id]
+        await self.flush_status_updates()
         
         results = []
-        for i, subtask in enumerate(subtasks):
-            print(f"📝 Executing subtask {i+1}/{len(subtasks)}: {subtask}")
-            await asyncio.sleep(1)  # Simulate execution time
-            
-            result = await self.execute_subtask(subtask)
-            results.append(result)
-            
-            # Send progress update to coordinator
-            if self.coordinator:
-                await self.send_message(
-                    "Coordinator",
-                    MessageType.STATUS_UPDATE,
-                    {
-                        "progress": (i + 1) / len(subtasks),
-                        "current_subtask": subtask,
-                        "subtask_result": result
-                    }
-                )
+        overall_status = "completed"
+        for subtask, outcome in zip(subtasks, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("❌ %s subtask %s failed: %s", self.name, subtask, outcome)
+                outcome = {"type": "error", "operation": subtask, "status": "failed", "error": str(outcome)}
+                overall_status = "failed"
+            results.append(outcome)
         
         final_result = {
             "plan_id": plan.get("task_id"),
             "subtask_results": results,
-            "overall_status": "completed",
+            "overall_status": overall_status,
             "total_subtasks": len(subtasks)
         }
         
@@ -142,9 +249,60 @@ class ExecutorAgent(Agent):
             {"execution_complete": True, "results": final_result}
         )
         
-        print(f"🎉 {self.name} completed all subtasks for plan")
+        if overall_status == "completed":
+            logger.info("🎉 %s completed all subtasks for plan", self.name)
     
-    async def execute_subtask(self, subtask: str) -> Dict[str, Any]:
+    async def _run_one_subtask(self, plan: Dict[str, Any], index: int, subtask: str, total: int) -> Dict[str, Any]:
+        task_id = plan.get("task_id")
+        logger.info("📝 Executing subtask %d/%d: %s", index + 1, total, subtask)
+        await asyncio.sleep(1)  # Simulate execution time
+        
+        result = await self.execute_subtask(subtask, plan.get("original_task", ""))
+        
+        # Subtasks finish in any order, so progress counts completions, not the index
+        self._completed_subtasks[task_id] += 1
+        
+        # Queue progress update; they reach the coordinator in batches
+        self._pending_updates.append({
+            "task_id": task_id,
+            "progress": self._completed_subtasks[task_id] / total,
+            "current_subtask": subtask,
+            "subtask_result": result
+        })
+        if len(self._pending_updates) >= self.status_batch_size:
+            await self.flush_status_updates()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+        
+        return result
+    
+    async def _flush_after_interval(self):
+        await asyncio.sleep(self.status_flush_interval)
+        self._flush_task = None
+        await self.flush_status_updates()
+    
+    async def flush_status_updates(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        
+        if not self._pending_updates:
+            return
+        
+        batch, self._pending_updates = self._pending_updates, []
+        if self.coordinator:
+            await self.send_message(
+                COORDINATOR_NAME,
+                MessageType.STATUS_UPDATE,
+                {"batch": batch}
+            )
+    
+    async def execute_subtask(self, subtask: str, task_description: str = "") -> Dict[str, Any]:
+        if subtask == "perform_calculation":
+            calculation = await self.perform_calculation(task_description)
+            status = "failed" if calculation["operation"] == "unknown" else "success"
+            return {"type": "calculation", "status": status, **calculation}
+        
         # Simulate different types of subtask execution
         if "data" in subtask.lower():
             return {"type": "data_operation", "status": "success", "records_processed": 100}
@@ -172,15 +330,52 @@ class ExecutorAgent(Agent):
         return {"report_pages": 10, "charts_created": 3}
     
     async def perform_calculation(self, data: str) -> Dict[str, Any]:
+        return await self._offload(self._calculate, data)
+    
+    def _calculate(self, data: str) -> Dict[str, Any]:
         # Simple calculator for demo
-        try:
-            # Extract numbers and basic operations
-            numbers = re.findall(r'\d+', data)
-            if len(numbers) >= 2:
-                result = int(numbers[0]) + int(numbers[1])
-                return {"calculation_result": result, "operation": "addition"}
-        except:
-            pass
+        interest = _COMPOUND_INTEREST_RE.search(data)
+        if interest:
+            try:
+                principal, rate, years = (_to_number(group) for group in interest.groups())
+                amount = _check_result(principal * (1 + rate / 100) ** years)
+            except (ValueError, OverflowError) as e:
+                return _calculation_failed(str(e))
+            return {
+                "calculation_result": round(amount, 2),
+                "interest_earned": round(amount - principal, 2),
+                "operation": "compound_interest"
+            }
+        
+        for match in _EXPR_RE.finditer(_DATE_RE.sub(" ", data)):
+            expression = match.group().strip()
+            # Past a possible leading sign, a lone number has no operator to apply
+            if not any(op in expression[1:] for op in "+-*/"):
+                continue
+            if len(expression) > _MAX_EXPRESSION_LENGTH:
+                return _calculation_failed("expression too long", expression=expression[:_MAX_EXPRESSION_LENGTH])
+            try:
+                tree = ast.parse(expression, mode="eval")
+            except (SyntaxError, RecursionError, MemoryError):
+                continue
+            # A lone (possibly negative) number is not a calculation
+            if not any(isinstance(node, ast.BinOp) for node in ast.walk(tree)):
+                continue
+            
+            try:
+                result = _eval_arithmetic(tree)
+            except (ValueError, ZeroDivisionError, OverflowError, RecursionError, MemoryError) as e:
+                return _calculation_failed(str(e) or type(e).__name__, expression=expression)
+            return {"calculation_result": result, "operation": "arithmetic", "expression": expression}
+        
+        # Fall back to adding the first two numbers mentioned
+        numbers = _NUM_RE.findall(data)
+        if len(numbers) >= 2:
+            try:
+                result = _check_result(_to_number(numbers[0]) + _to_number(numbers[1]))
+            except (ValueError, OverflowError) as e:
+                return _calculation_failed(str(e))
+            return {"calculation_result": result, "operation": "addition"}
         return {"calculation_result": "Unable to calculate", "operation": "unknown"}
     
     async def process_text(self, text: str) -> Dict[str, Any]:
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest import mock
+
+import coordinator
+from agent_base import Message, MessageType
+from coordinator import TaskCoordinator, create_demo_system
+from specialized_agents import ExecutorAgent
+
+
+def coordinator_with_result(content):
+    task_coordinator = TaskCoordinator()
+    asyncio.run(task_coordinator.route_message(
+        Message("msg-1", "Executor", "Planner", MessageType.RESULT, content, 1.5)
+    ))
+    return task_coordinator
+
+
+class HistoryJsonTests(unittest.TestCase):
+    def assert_encodes_with_and_without_orjson(self, task_coordinator, expected_content):
+        encoders = [None] if coordinator.orjson is None else [coordinator.orjson, None]
+        for encoder in encoders:
+            with self.subTest(orjson=encoder is not None), mock.patch.object(coordinator, "orjson", encoder):
+                [message] = json.loads(task_coordinator.history_json(0))
+                self.assertEqual(message["content"], expected_content)
+                self.assertEqual(message["message_type"], "result")
+
+    def test_matches_get_message_history(self):
+        task_coordinator = coordinator_with_result({"value": "é"})
+        self.assertEqual(json.loads(task_coordinator.history_json()), task_coordinator.get_message_history())
+
+    def test_integers_beyond_64_bits(self):
+        task_coordinator = coordinator_with_result({"calculation_result": 10**23})
+        self.assert_encodes_with_and_without_orjson(task_coordinator, {"calculation_result": 10**23})
+
+    def test_non_finite_floats_become_null(self):
+        task_coordinator = coordinator_with_result({"values": [float("inf"), float("nan"), 1.5]})
+        self.assert_encodes_with_and_without_orjson(task_coordinator, {"values": [None, None, 1.5]})
+
+
+class WaitForTaskTests(unittest.TestCase):
+    def test_failed_subtask_resolves_the_task(self):
+        async def run():
+            task_coordinator = await create_demo_system()
+            await task_coordinator.start_agents()
+            try:
+                task_id = await task_coordinator.submit_user_task("Analyze the sales data")
+                result = await task_coordinator.wait_for_task(task_id, timeout=10)
+                return task_coordinator, task_id, result
+            finally:
+                await task_coordinator.stop_agents()
+
+        original = ExecutorAgent.execute_subtask
+
+        async def execute_subtask(agent, subtask, task_description=""):
+            if subtask == "clean_data":
+                raise RuntimeError("disk full")
+            return await original(agent, subtask, task_description)
+
+        started = time.monotonic()
+        with mock.patch.object(ExecutorAgent, "execute_subtask", execute_subtask):
+            task_coordinator, task_id, result = asyncio.run(run())
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result["results"]["overall_status"], "failed")
+        self.assertEqual(task_coordinator.active_tasks[task_id]["status"], "failed")
+        self.assertNotIn(task_id, task_coordinator._task_futures)
+        statuses = [subtask["status"] for subtask in result["results"]["subtask_results"]]
+        self.assertEqual(statuses.count("failed"), 1)
+        self.assertEqual(statuses.count("success"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import asyncio
+import time
+import unittest
+
+from specialized_agents import ExecutorAgent
+
+
+def run_with_executor(method: str, *args):
+    # Agents create asyncio primitives, so build them inside the running loop
+    async def call():
+        return await getattr(ExecutorAgent(), method)(*args)
+    return asyncio.run(call())
+
+
+def calculate(text: str):
+    return run_with_executor("perform_calculation", text)
+
+
+class PerformCalculationTests(unittest.TestCase):
+    def test_compound_interest(self):
+        result = calculate("Calculate the compound interest for $1000 at 5% annually for 10 years")
+        self.assertEqual(result["operation"], "compound_interest")
+        self.assertEqual(result["calculation_result"], 1628.89)
+        self.assertEqual(result["interest_earned"], 628.89)
+
+    def test_arithmetic_respects_precedence(self):
+        result = calculate("what is 2 + 3 * (4 - 1)?")
+        self.assertEqual(result["operation"], "arithmetic")
+        self.assertEqual(result["calculation_result"], 11)
+
+    def test_negative_operands(self):
+        self.assertEqual(calculate("-3.5*2")["calculation_result"], -7.0)
+        self.assertEqual(calculate("(1+2)*-3")["calculation_result"], -9)
+
+    def test_lone_negative_number_is_not_arithmetic(self):
+        result = calculate("temperature is -5 today and 10 tomorrow")
+        self.assertEqual(result["operation"], "addition")
+
+    def test_dates_are_not_arithmetic(self):
+        self.assertNotEqual(calculate("meeting on 2024-10-14")["operation"], "arithmetic")
+        self.assertNotEqual(calculate("due 10/14/2024")["operation"], "arithmetic")
+
+    def test_oversized_power_is_rejected_quickly(self):
+        for expression in ["((((10**100)**100)**100)**100)", "9**9**9", "2**2000"]:
+            started = time.monotonic()
+            result = calculate(expression)
+            self.assertLess(time.monotonic() - started, 1.0)
+            self.assertEqual(result["calculation_result"], "Unable to calculate")
+            self.assertEqual(result["error"], "result too large")
+
+    def test_complex_result_is_rejected(self):
+        result = calculate("(-8) ** 0.5")
+        self.assertEqual(result["calculation_result"], "Unable to calculate")
+        self.assertEqual(result["error"], "complex result")
+
+    def test_long_expression_is_rejected(self):
+        result = calculate("Calculate " + "+".join(["1"] * 1500))
+        self.assertEqual(result["calculation_result"], "Unable to calculate")
+        self.assertEqual(result["error"], "expression too long")
+
+    def test_deeply_nested_expression_is_rejected(self):
+        result = calculate("(" * 150 + "1+1" + ")" * 150)
+        self.assertEqual(result["calculation_result"], "Unable to calculate")
+
+    def test_very_long_numbers_are_rejected(self):
+        huge = "9" * 5000
+        for text in [huge + " and 1", f"compound interest for ${huge} at 5% for 10 years"]:
+            result = calculate(text)
+            self.assertEqual(result["calculation_result"], "Unable to calculate")
+            self.assertEqual(result["error"], "number too long")
+
+    def test_addition_result_is_bounded(self):
+        result = calculate("9" * 350 + " and 1")
+        self.assertEqual(result["error"], "result too large")
+        self.assertEqual(calculate("99999999999999999999999 and 1")["calculation_result"], 10**23)
+
+    def test_non_finite_compound_interest_is_rejected(self):
+        result = calculate("compound interest for $" + "9" * 307 + " at 100% for 10 years")
+        self.assertEqual(result["calculation_result"], "Unable to calculate")
+        self.assertEqual(result["error"], "result is not finite")
+
+    def test_division_by_zero(self):
+        self.assertEqual(calculate("1/0")["calculation_result"], "Unable to calculate")
+
+    def test_falls_back_to_adding_first_two_numbers(self):
+        result = calculate("add 7 and 8")
+        self.assertEqual(result, {"calculation_result": 15, "operation": "addition"})
+
+    def test_nothing_to_calculate(self):
+        self.assertEqual(calculate("hello")["operation"], "unknown")
+
+
+class ExecuteSubtaskTests(unittest.TestCase):
+    def test_calculation_subtask_uses_task_description(self):
+        result = run_with_executor(
+            "execute_subtask",
+            "perform_calculation",
+            "Calculate the compound interest for $1000 at 5% annually for 10 years"
+        )
+        self.assertEqual(result["type"], "calculation")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["calculation_result"], 1628.89)
+
+    def test_failed_calculation_subtask(self):
+        result = run_with_executor("execute_subtask", "perform_calculation", "hello")
+        self.assertEqual(result["status"], "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()